@@ -3,14 +3,88 @@
 Filter and display tasks by priority [1], [2], [3] sequentially.
 """
 
+from contextlib import contextmanager
+from itertools import chain
+import mmap
+import os
 from pathlib import Path
 import re
 import sys
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 TODAY_FILE = Path(__file__).resolve().parent.parent / "02.1_today.txt"
+
 PRIORITY_PATTERN = re.compile(r'^\s*\[([123])\]\s*(.*)$')
 
+# ASCII whitespace other than b'\n' (with \x1f, which str.strip() also
+# removes) and the UTF-8 forms of the non-ASCII spaces it removes (nbsp and
+# friends)
+ASCII_WS = rb'[\t\x0b\x0c\r\x1f ]'
+UNICODE_SPACES = rb'(?:\xc2\xa0|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xaf]|\xe2\x81\x9f|\xe3\x80\x80)'
+
+# One whitespace character, and a run of them in which the ASCII ones are
+# matched by a plain one-byte loop
+WS = rb'(?:' + ASCII_WS + rb'|' + UNICODE_SPACES + rb')'
+WS_RUN = ASCII_WS + rb'*(?:' + UNICODE_SPACES + ASCII_WS + rb'*)*'
+INDENT_RE = re.compile(WS_RUN)
+
+# Only the lines the parser acts on: unindented lines (sections or legends)
+# and indented priority tags, each tag together with its plainly nested lines
+# (blank, or indented by the tag's own indent plus more whitespace). Legend
+# tags ("[1] = ...") aren't matched at all. Everything else is skipped inside
+# the regex engine. Works on bytes so lines we skip are never decoded.
+# Whitespace runs are captured in a lookahead and then consumed by
+# backreference, so a line that fails to match is never backtracked through.
+BLOCK = (
+    rb'(?:(?P<section>(?!' + WS + rb')\S.*)'
+    rb'|(?=' + WS + rb')(?=(?P<indent>' + WS_RUN + rb'))(?P=indent)\[(?P<pri>[123])\][^=\n]*'
+    rb'(?:\n(?!\Z)(?:(?P=indent)' + WS + rb'.*|(?=(?P<blank>' + WS_RUN + rb'))(?P=blank)$))*)$'
+)
+# Each match starts at the newline before its line: a literal the engine can
+# search for, where a bare ^ is tried at every byte. FIRST_BLOCK_RE matches
+# the first line, which has no newline before it.
+BLOCK_RE = re.compile(rb'\n' + BLOCK, re.MULTILINE)
+FIRST_BLOCK_RE = re.compile(BLOCK, re.MULTILINE)
+
+# Line breaks splitlines() honours besides b'\n', as UTF-8: a lone CR (CRLF
+# lines are handled by dropping the CR) and the other separators. Each is
+# keyed by one byte that a quick find() rules out first; None means the byte
+# is the line break.
+LONE_CR_RE = re.compile(rb'\r(?!\n)')
+UNICODE_BREAK_RE = re.compile(rb'\xc2\x85|\xe2\x80[\xa8\xa9]')
+OTHER_LINE_BREAKS = [
+    (b'\r', LONE_CR_RE),
+    (b'\x0b', None),
+    (b'\x0c', None),
+    (b'\x1c', None),
+    (b'\x1d', None),
+    (b'\x1e', None),
+    (b'\x85', UNICODE_BREAK_RE),
+    (b'\xa8', UNICODE_BREAK_RE),
+    (b'\xa9', UNICODE_BREAK_RE),
+]
+
+
+def normalize_line_breaks(data: bytes) -> bytes:
+    """Rewrite data so each line splitlines() sees ends in b'\\n' (if it needs it)."""
+    for byte, pattern in OTHER_LINE_BREAKS:
+        if data.find(byte) >= 0 and (pattern is None or pattern.search(data)):
+            break
+    else:
+        return data
+    return ''.join([line + '\n' for line in data[:].decode('utf-8').splitlines()]).encode('utf-8')
+
+
+@contextmanager
+def mapped(file_path: Path) -> Iterator[bytes]:
+    """Map file read-only (empty files can't be mapped, so they give b'')."""
+    with open(file_path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
 
 def leading_indent(line: str) -> int:
     """Count leading tabs/spaces."""
@@ -18,18 +92,11 @@ def leading_indent(line: str) -> int:
     return len(expanded) - len(expanded.lstrip())
 
 
-def parse_file(file_path: Path) -> Dict[int, List[Tuple[str, List[str]]]]:
+def collect_lines(lines: List[str], current_section: str | None, priorities: Dict[int, List[Tuple[str, List[str]]]]) -> None:
     """
-    Parse file and return dict: {priority: [(section, [lines])]}
+    Add the tasks in lines to priorities one line at a time, telling nested
+    lines apart by their measured indent.
     """
-    if not file_path.exists():
-        print(f"Error: {file_path} not found", file=sys.stderr)
-        sys.exit(1)
-    
-    lines = file_path.read_text().splitlines()
-    priorities: Dict[int, List[Tuple[str, List[str]]]] = {1: [], 2: [], 3: []}
-    
-    current_section: str | None = None
     i = 0
     
     while i < len(lines):
@@ -51,10 +118,9 @@ def parse_file(file_path: Path) -> Dict[int, List[Tuple[str, List[str]]]]:
         match = PRIORITY_PATTERN.match(line)
         if match:
             priority = int(match.group(1))
-            task_line = line
             
             # Collect nested subtasks
-            task_lines = [task_line]
+            task_lines = [line]
             task_indent = leading_indent(line)
             i += 1
             
@@ -68,50 +134,87 @@ def parse_file(file_path: Path) -> Dict[int, List[Tuple[str, List[str]]]]:
                     break
                 
                 # Stop if next line is at same or higher indent level (another task)
-                next_indent = leading_indent(next_line)
-                if next_stripped and next_indent <= task_indent:
-                    # Check if it's another priority task
-                    if PRIORITY_PATTERN.match(next_line):
-                        break
-                    # Otherwise it's a sibling task, stop collecting
+                if next_stripped and leading_indent(next_line) <= task_indent:
                     break
                 
                 # Include empty lines and nested content
                 task_lines.append(next_line)
                 i += 1
             
-            # Add to priorities dict
             section_name = current_section or "Uncategorized"
             priorities[priority].append((section_name, task_lines))
         else:
             i += 1
+
+
+def collect_priorities(data: bytes) -> Dict[int, List[Tuple[str, List[str]]]]:
+    """Build {priority: [(section, [lines])]} from BLOCK_RE matches in file order."""
+    priorities: Dict[int, List[Tuple[str, List[str]]]] = {1: [], 2: [], 3: []}
+    current_section: str | None = None
+    
+    first = FIRST_BLOCK_RE.match(data)
+    matches = BLOCK_RE.finditer(data, first.end() if first else 0)
+    for match in chain([first] if first else [], matches):
+        section, indent, pri = match.group('section', 'indent', 'pri')
+        if section is not None:
+            if not (section.startswith(b'[') and b'=' in section):
+                current_section = section.decode('utf-8').rstrip()
+            continue
+        
+        # The match stops at a line that isn't blank and doesn't start with
+        # indent plus whitespace. An unindented line, or one indented by
+        # indent or a prefix of it, ends the task. Any other indentation
+        # (tabs and spaces mixed, say) has to be measured, so the rest of the
+        # file goes through collect_lines.
+        start = match.start('indent')
+        end = match.end()
+        if not indent.startswith(INDENT_RE.match(data, end + 1).group()):
+            collect_lines(data[start:].decode('utf-8').splitlines(), current_section, priorities)
+            break
+        
+        task_lines = [task_line.rstrip('\r') for task_line in data[start:end].decode('utf-8').split('\n')]
+        section_name = current_section or "Uncategorized"
+        priorities[int(pri)].append((section_name, task_lines))
     
     return priorities
 
 
+def parse_file(file_path: Path) -> Dict[int, List[Tuple[str, List[str]]]]:
+    """
+    Parse file and return dict: {priority: [(section, [lines])]}
+    """
+    try:
+        with mapped(file_path) as data:
+            return collect_priorities(normalize_line_breaks(data))
+    except FileNotFoundError:
+        print(f"Error: {file_path} not found", file=sys.stderr)
+        sys.exit(1)
+
+
 def output_priorities(priorities: Dict[int, List[Tuple[str, List[str]]]]):
     """Output priorities sequentially: 1, 2, 3"""
+    # Build the whole report and write it once instead of a print() per line
+    out: List[str] = []
     for priority in [1, 2, 3]:
         items = priorities[priority]
         if not items:
             continue
         
-        print(f"\n{'='*60}")
-        print(f"PRIORITY [{priority}]")
-        print(f"{'='*60}\n")
+        out.append(f"\n{'='*60}\nPRIORITY [{priority}]\n{'='*60}\n\n")
         
         current_section = None
         for section, task_lines in items:
             if section != current_section:
                 if current_section is not None:
-                    print()
-                print(section)
+                    out.append("\n")
+                out.append(section + "\n")
                 current_section = section
             
-            for task_line in task_lines:
-                print(task_line)
+            out.append("\n".join(task_lines) + "\n")
         
-        print()
+        out.append("\n")
+    
+    sys.stdout.write("".join(out))
 
 
 def main() -> int:
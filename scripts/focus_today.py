@@ -3,6 +3,8 @@
 Show only [1] priority items from today's file.
 """
 
+import mmap
+import os
 from pathlib import Path
 import re
 import sys
@@ -10,58 +12,100 @@ from typing import List, Tuple
 
 
 TODAY_FILE = Path(__file__).resolve().parent.parent / "02.1_today.txt"
-PRIORITY_1_PATTERN = re.compile(r'^\s*\[1\]\s*(.*)$')
 
+# UTF-8 forms of the non-ASCII spaces str.strip() removes (nbsp and friends)
+UNICODE_SPACES = rb'\x1f|\xc2\xa0|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xaf]|\xe2\x81\x9f|\xe3\x80\x80'
 
-def parse_today_priority1(file_path: Path) -> List[Tuple[str, str]]:
-    """
-    Parse file and return list of [(section, task_text)] for [1] items only.
-    Only returns top-level tasks, no nested children.
-    """
-    if not file_path.exists():
-        print(f"Error: {file_path} not found", file=sys.stderr)
-        sys.exit(1)
-    
-    lines = file_path.read_text().splitlines()
+# Leading whitespace, including the spaces above
+WS = rb'(?:[^\S\n]|' + UNICODE_SPACES + rb')'
+
+# One anchored pass that only stops on the lines we act on: unindented lines
+# (sections or legends) and indented [1] tags. Works on bytes so lines we skip
+# are never decoded.
+SCAN_RE = re.compile(
+    rb'^(?:(?P<section>(?!' + WS + rb')\S.*)'
+    rb'|' + WS + rb'+\[1\](?P<task>.*))$',
+    re.MULTILINE,
+)
+
+# Line breaks splitlines() honours besides b'\n', as UTF-8: a lone CR (CRLF
+# lines are handled by dropping the CR) and the other separators. Each is
+# keyed by one byte that a quick find() rules out first; None means the byte
+# is the line break.
+LONE_CR_RE = re.compile(rb'\r(?!\n)')
+UNICODE_BREAK_RE = re.compile(rb'\xc2\x85|\xe2\x80[\xa8\xa9]')
+OTHER_LINE_BREAKS = [
+    (b'\r', LONE_CR_RE),
+    (b'\x0b', None),
+    (b'\x0c', None),
+    (b'\x1c', None),
+    (b'\x1d', None),
+    (b'\x1e', None),
+    (b'\x85', UNICODE_BREAK_RE),
+    (b'\xa8', UNICODE_BREAK_RE),
+    (b'\xa9', UNICODE_BREAK_RE),
+]
+
+
+def normalize_line_breaks(data: bytes) -> bytes:
+    """Rewrite data so each line splitlines() sees ends in b'\\n' (if it needs it)."""
+    for byte, pattern in OTHER_LINE_BREAKS:
+        if data.find(byte) >= 0 and (pattern is None or pattern.search(data)):
+            break
+    else:
+        return data
+    return ''.join([line + '\n' for line in data[:].decode('utf-8').splitlines()]).encode('utf-8')
+
+
+def scan_priority1(data: bytes) -> List[Tuple[str, str]]:
+    """Return [(section, task_text)] for top-level [1] items in data."""
     priority1_items: List[Tuple[str, str]] = []
     
     current_section: str | None = None
-    i = 0
     
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
+    for match in SCAN_RE.finditer(data):
+        section, task = match.group('section', 'task')
         
-        # Skip empty lines and legend lines
-        if not stripped or (stripped.startswith('[') and '=' in stripped):
-            i += 1
+        # Check if it's a section header (no leading whitespace), skipping legend lines
+        if section is not None:
+            if not (section.startswith(b'[') and b'=' in section):
+                current_section = section.decode('utf-8').rstrip()
             continue
         
-        # Check if it's a section header (no leading whitespace)
-        if line.lstrip() == line and stripped:
-            current_section = stripped
-            i += 1
+        # [1] priority tag; nested children are simply skipped
+        if b'=' in task:
             continue
         
-        # Check for [1] priority tag
-        match = PRIORITY_1_PATTERN.match(line)
-        if match:
-            # Extract just the task text (remove [1] tag and leading whitespace)
-            task_text = match.group(1).strip()
-            
-            # Skip if empty
-            if task_text:
-                section_name = current_section or "Uncategorized"
-                priority1_items.append((section_name, task_text))
-            
-            # Skip nested children - just move to next line
-            i += 1
-        else:
-            i += 1
+        # Extract just the task text (remove [1] tag and leading whitespace)
+        task_text = task.decode('utf-8').strip()
+        
+        # Skip if empty
+        if task_text:
+            section_name = current_section or "Uncategorized"
+            priority1_items.append((section_name, task_text))
     
     return priority1_items
 
 
+def parse_today_priority1(file_path: Path) -> List[Tuple[str, str]]:
+    """
+    Parse file and return list of [(section, task_text)] for [1] items only.
+    Only returns top-level tasks, no nested children.
+    """
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        print(f"Error: {file_path} not found", file=sys.stderr)
+        sys.exit(1)
+    
+    with f:
+        # Empty files can't be mapped
+        if not os.fstat(f.fileno()).st_size:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return scan_priority1(normalize_line_breaks(data))
+
+
 def display_priority1(items: List[Tuple[str, str]]):
     """Display [1] priority items in 'section / task' format."""
     if not items:
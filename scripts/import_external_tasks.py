@@ -4,23 +4,35 @@
 from __future__ import annotations
 
 import argparse
+import errno
 import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
+from hashlib import blake2b
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Callable, Dict, List, Sequence
 
 from task_status_view import (  # type: ignore
     TaskEntry,
     load_config,
     normalize_status_filters,
     parse_file,
+    parse_lines,
 )
 
 ROOT = Path(__file__).resolve().parent.parent
 TODAY_FILE = ROOT / "02.1_today.txt"
 DEFAULT_SECTION = "Imported"
 DEFAULT_STATUS_FILTER = ["in-progress", "blocked"]
+MAX_LOAD_WORKERS = 8
+# Open errors that mean there is no source file at the path (what is_file()
+# reports as False); anything else, like a permission error, is raised.
+MISSING_SOURCE_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EISDIR, errno.ELOOP})
+# Shared indent prefixes so building blocks doesn't allocate "\t" * n each time.
+_TABS = tuple("\t" * depth for depth in range(32))
 
 
 @dataclass
@@ -52,6 +64,18 @@ def coerce_path(path_str: str) -> Path:
     return candidate
 
 
+def index_extra_files(config: Dict[str, Any]) -> Dict[str, List[Path]]:
+    """Map the name and stem of each configured extra file to its paths, in config order."""
+    index: Dict[str, List[Path]] = {}
+    for entry in config.get("extra_files", []):
+        if not isinstance(entry, str):
+            continue
+        entry_path = coerce_path(entry)
+        for key in {entry_path.name, entry_path.stem}:
+            index.setdefault(key, []).append(entry_path)
+    return index
+
+
 def resolve_manual_source(path_arg: str, config: Dict[str, Any], target_specs: Dict[str, ImportSpec]) -> Path:
     if not path_arg:
         raise FileNotFoundError("Source path cannot be empty.")
@@ -59,29 +83,20 @@ def resolve_manual_source(path_arg: str, config: Dict[str, Any], target_specs: D
     if path_arg in target_specs:
         return target_specs[path_arg].source_path
 
-    candidates = []
-
     direct = coerce_path(path_arg)
     if direct.exists():
-        candidates.append(direct)
+        return direct
 
     relative = (ROOT / path_arg).resolve()
     if relative.exists():
-        candidates.append(relative)
-
-    for entry in config.get("extra_files", []):
-        if not isinstance(entry, str):
-            continue
-        entry_path = coerce_path(entry)
-        if not entry_path.exists():
-            continue
-        if entry_path.name == path_arg or entry_path.stem == path_arg:
-            candidates.append(entry_path)
+        return relative
 
-    if not candidates:
-        raise FileNotFoundError(f"Could not find source '{path_arg}'.")
+    # Only extra files whose name matches are checked on disk
+    for entry_path in index_extra_files(config).get(path_arg, []):
+        if entry_path.exists():
+            return entry_path
 
-    return candidates[0]
+    raise FileNotFoundError(f"Could not find source '{path_arg}'.")
 
 
 def build_config_targets(config: Dict[str, Any]) -> Dict[str, ImportSpec]:
@@ -126,15 +141,16 @@ def build_config_targets(config: Dict[str, Any]) -> Dict[str, ImportSpec]:
 
 
 def gather_tasks(source_path: Path, statuses: Sequence[str]) -> List[TaskEntry]:
-    if not source_path.is_file():
-        raise FileNotFoundError(f"Source file not found: {source_path}")
-    entries = parse_file(source_path)
+    try:
+        entries = parse_file(source_path, set(statuses))
+    except OSError as exc:
+        if exc.errno not in MISSING_SOURCE_ERRNOS:
+            raise
+        raise FileNotFoundError(f"Source file not found: {source_path}") from None
     filtered: List[TaskEntry] = []
     seen_blocks: set[str] = set()
     for entry in entries:
-        if entry.status not in statuses:
-            continue
-        block_text = canonicalize_lines(entry.lines)
+        block_text = entry.canonical_key
         if not block_text or block_text in seen_blocks:
             continue
         seen_blocks.add(block_text)
@@ -142,36 +158,29 @@ def gather_tasks(source_path: Path, statuses: Sequence[str]) -> List[TaskEntry]:
     return filtered
 
 
-def find_section_indices(lines: List[str], section: str) -> tuple[int, int]:
-    section_idx = -1
-    insert_idx = len(lines)
+def index_sections(lines: List[str]) -> Dict[str, tuple[int, int]]:
+    """Map each top-level section to (header index, index where its content ends)."""
+    sections: Dict[str, tuple[int, int]] = {}
+    open_section: str | None = None
     for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if line.lstrip() != line:
+        if not line or line[0].isspace():
             continue
-        if stripped == section:
-            section_idx = idx
-            next_idx = len(lines)
-            for j in range(idx + 1, len(lines)):
-                next_line = lines[j]
-                next_stripped = next_line.strip()
-                if not next_stripped:
-                    continue
-                if next_line.lstrip() == next_line:
-                    next_idx = j
-                    break
-            insert_idx = next_idx
-            break
-    return section_idx, insert_idx
-
-
-def canonicalize_lines(lines: List[str]) -> str:
-    normalized = [line.strip() for line in lines if line.strip()]
-    return "\n".join(normalized)
+        if open_section is not None:
+            sections[open_section] = (sections[open_section][0], idx)
+            open_section = None
+        name = line.rstrip()
+        if name not in sections:
+            sections[name] = (idx, len(lines))
+            open_section = name
+    return sections
+
+
+def block_digest(block_key: str) -> bytes:
+    """16-byte stand-in for a canonical block, used for duplicate checks."""
+    return blake2b(block_key.encode(), digest_size=16).digest()
 
 
+@lru_cache(maxsize=None)
 def heading_level(label: str) -> int | None:
     stripped = label.lstrip()
     if not stripped.startswith("#"):
@@ -180,26 +189,32 @@ def heading_level(label: str) -> int | None:
     return count
 
 
-def normalize_heading_chain(chain: List[str]) -> List[str]:
-    cleaned = [label.strip() for label in chain if label.strip()]
-    if not cleaned:
-        return []
-    levels = [heading_level(label) for label in cleaned]
-    if any(level is not None and level >= 2 for level in levels):
-        for idx, level in enumerate(levels):
-            if level is not None and level >= 2:
-                return cleaned[idx:]
+@lru_cache(maxsize=None)
+def normalize_heading_chain(chain: tuple[str, ...]) -> tuple[str, ...]:
+    # Many entries share a heading chain, so results are cached per chain.
+    cleaned = tuple(label.strip() for label in chain if label.strip())
+    for idx, label in enumerate(cleaned):
+        level = heading_level(label)
+        if level is not None and level >= 2:
+            return cleaned[idx:]
     return cleaned
 
 
+def tab_indent(depth: int) -> str:
+    return _TABS[depth] if depth < len(_TABS) else "\t" * depth
+
+
 def reindent_entry_lines(lines: List[str], indent_prefix: str) -> List[str]:
     adjusted: List[str] = []
+    width = len(indent_prefix)
     for line in lines:
-        stripped = line.strip()
-        if not stripped:
+        if not line or line.isspace():
             adjusted.append("")
+        # Already indent_prefix + stripped text: reuse the line as it is.
+        elif line.startswith(indent_prefix) and not line[width].isspace() and not line[-1].isspace():
+            adjusted.append(line)
         else:
-            adjusted.append(f"{indent_prefix}{stripped}")
+            adjusted.append(indent_prefix + line.strip())
     return adjusted
 
 
@@ -207,8 +222,8 @@ def build_heading_block(heading_chain: List[str], entries: List[TaskEntry]) -> L
     lines: List[str] = []
     if heading_chain:
         for level, heading in enumerate(heading_chain, start=1):
-            lines.append(f"{'\t' * level}{heading}")
-    entry_indent = "\t" * (len(heading_chain) + 1 if heading_chain else 1)
+            lines.append(tab_indent(level) + heading)
+    entry_indent = tab_indent(len(heading_chain) + 1 if heading_chain else 1)
     for idx, entry in enumerate(entries):
         lines.extend(reindent_entry_lines(entry.lines, entry_indent))
         if idx != len(entries) - 1:
@@ -218,45 +233,112 @@ def build_heading_block(heading_chain: List[str], entries: List[TaskEntry]) -> L
     return lines
 
 
-def determine_section(spec: ImportSpec, entry: TaskEntry) -> str:
-    section_name = entry.section.strip() if entry.section else ""
-    if section_name and section_name in spec.section_map:
-        return spec.section_map[section_name] or spec.section
-    if spec.use_source_section and section_name:
-        return section_name
-    return spec.section
-
+def make_section_resolver(spec: ImportSpec) -> Callable[[str], str]:
+    """Return a function mapping an entry's source section to its target section, memoized per name."""
+    resolved: Dict[str, str] = {}
 
-def insert_into_section(lines: List[str], section: str, block: List[str]) -> List[str]:
-    new_lines = list(lines)
-    if not new_lines:
-        new_lines = []
-    section_idx, insert_idx = find_section_indices(new_lines, section)
-
-    if section_idx == -1:
+    def resolve(entry_section: str) -> str:
+        target = resolved.get(entry_section)
+        if target is not None:
+            return target
+        section_name = entry_section.strip() if entry_section else ""
+        if section_name and section_name in spec.section_map:
+            target = spec.section_map[section_name] or spec.section
+        elif spec.use_source_section and section_name:
+            target = section_name
+        else:
+            target = spec.section
+        resolved[entry_section] = target
+        return target
+
+    return resolve
+
+
+def insert_section_blocks(lines: List[str], blocks: Dict[str, List[str]]) -> List[str]:
+    """Insert every section's block in one pass; missing sections are appended in order."""
+    sections = index_sections(lines)
+    inserts: Dict[int, List[str]] = {}
+    missing: List[str] = []
+    for section, block in blocks.items():
+        bounds = sections.get(section)
+        if bounds is None:
+            missing.append(section)
+            continue
+        insert_idx = bounds[1]
+        # Blocks are always indented, so each section keeps its own insert point.
+        lead = [""] if insert_idx > 0 and lines[insert_idx - 1].strip() else []
+        trail = [""] if insert_idx < len(lines) and lines[insert_idx].strip() else []
+        inserts[insert_idx] = lead + block + trail
+
+    new_lines: List[str] = []
+    prev_idx = 0
+    for insert_idx in sorted(inserts):
+        new_lines += lines[prev_idx:insert_idx]
+        new_lines += inserts[insert_idx]
+        prev_idx = insert_idx
+    new_lines += lines[prev_idx:]
+
+    for section in missing:
         if new_lines and new_lines[-1].strip():
             new_lines.append("")
         new_lines.append(section)
         new_lines.append("")
-        insert_idx = len(new_lines)
-    else:
-        if insert_idx > 0 and new_lines[insert_idx - 1].strip():
-            new_lines.insert(insert_idx, "")
-            insert_idx += 1
+        new_lines += blocks[section]
 
-    for line in block:
-        new_lines.insert(insert_idx, line)
-        insert_idx += 1
+    return new_lines
 
-    if insert_idx < len(new_lines) and new_lines[insert_idx].strip():
-        new_lines.insert(insert_idx, "")
 
-    return new_lines
+def write_lines(path: Path, lines: List[str]) -> None:
+    """Same output as writing "\n".join(lines).rstrip() + "\n", without building that string."""
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as fh:
+        if end:
+            fh.writelines(line + "\n" for line in islice(lines, end - 1))
+            fh.write(lines[end - 1].rstrip())
+        fh.write("\n")
 
 
-def run_single_import(spec: ImportSpec, *, dry_run: bool, quiet: bool) -> int:
+def trim_trailing_blanks(lines: List[str]) -> None:
+    """Trim lines in place to what write_lines writes: no trailing blank lines or trailing whitespace."""
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if lines:
+        lines[-1] = lines[-1].rstrip()
+
+
+def load_source(spec: ImportSpec) -> List[TaskEntry]:
+    return gather_tasks(spec.source_path, spec.statuses)
+
+
+def block_keys(today_lines: List[str]) -> List[tuple[str, bytes]]:
+    """(status, digest) of each task block in the today file's lines."""
+    return [(entry.status, block_digest(entry.canonical_key)) for entry in parse_lines(today_lines, TODAY_FILE)]
+
+
+def load_today() -> tuple[List[str], List[tuple[str, bytes]]]:
+    """Read the today file once: its lines and the block_keys of them."""
+    today_lines = TODAY_FILE.read_text().splitlines()
+    return today_lines, block_keys(today_lines)
+
+
+def run_single_import(
+    spec: ImportSpec,
+    today: Callable[[], tuple[List[str], List[tuple[str, bytes]]]],
+    loaded: Future[List[TaskEntry]] | None = None,
+    *,
+    dry_run: bool,
+    quiet: bool,
+) -> int:
+    """
+    Import spec's tasks into the today file's lines (updated in place, not
+    written). today returns those lines and their block_keys, refreshed after
+    an import; tasks matching a block with one of spec's statuses are
+    duplicates.
+    """
     try:
-        tasks = gather_tasks(spec.source_path, spec.statuses)
+        tasks = loaded.result() if loaded is not None else load_source(spec)
     except FileNotFoundError as exc:
         if not quiet:
             print(f"[{spec.name}] Skipping: {exc}")
@@ -267,28 +349,21 @@ def run_single_import(spec: ImportSpec, *, dry_run: bool, quiet: bool) -> int:
             print(f"[{spec.name}] No tasks matched statuses {spec.statuses}.")
         return 0
 
-    today_text = TODAY_FILE.read_text()
-    try:
-        today_entries = parse_file(TODAY_FILE)
-    except FileNotFoundError:
-        today_entries = []
-    existing_keys = {
-        canonicalize_lines(entry.lines)
-        for entry in today_entries
-        if entry.status in spec.statuses
-    }
+    today_lines, today_keys = today()
+    existing_keys = {block_id for status, block_id in today_keys if status in spec.statuses}
     unique_tasks: List[TaskEntry] = []
     duplicates = 0
 
     for entry in tasks:
-        block_key = canonicalize_lines(entry.lines)
+        block_key = entry.canonical_key
         if not block_key:
             continue
-        if not spec.allow_duplicates and block_key in existing_keys:
+        block_id = block_digest(block_key)
+        if not spec.allow_duplicates and block_id in existing_keys:
             duplicates += 1
             continue
         unique_tasks.append(entry)
-        existing_keys.add(block_key)
+        existing_keys.add(block_id)
 
     if not unique_tasks:
         if not quiet:
@@ -298,13 +373,12 @@ def run_single_import(spec: ImportSpec, *, dry_run: bool, quiet: bool) -> int:
     section_groups: Dict[str, Dict[tuple[str, ...], List[TaskEntry]]] = {}
     section_order: List[str] = []
     heading_order: Dict[str, List[tuple[str, ...]]] = {}
+    resolve_section = make_section_resolver(spec)
     for entry in unique_tasks:
-        target_section = determine_section(spec, entry)
-        heading_chain = normalize_heading_chain(entry.headings.copy())
-        fallback_heading = entry.section.strip() or target_section
-        if not heading_chain:
-            heading_chain = [fallback_heading]
-        heading_key = tuple(heading_chain)
+        target_section = resolve_section(entry.section)
+        heading_key = normalize_heading_chain(tuple(entry.headings))
+        if not heading_key:
+            heading_key = (entry.section.strip() or target_section,)
         if target_section not in section_groups:
             section_groups[target_section] = {}
             section_order.append(target_section)
@@ -326,15 +400,18 @@ def run_single_import(spec: ImportSpec, *, dry_run: bool, quiet: bool) -> int:
                         print(line)
         return 0
 
-    today_lines = today_text.splitlines()
+    section_blocks: Dict[str, List[str]] = {}
     for section in section_order:
         block_lines: List[str] = []
         for heading in heading_order[section]:
             block_lines.extend(build_heading_block(list(heading), section_groups[section][heading]))
         while block_lines and block_lines[-1] == "":
             block_lines.pop()
-        today_lines = insert_into_section(today_lines, section, block_lines)
-    TODAY_FILE.write_text("\n".join(today_lines).rstrip() + "\n")
+        section_blocks[section] = block_lines
+    today_lines[:] = insert_section_blocks(today_lines, section_blocks)
+    # As it will be read back once written, for the imports after this one
+    trim_trailing_blanks(today_lines)
+    today_keys[:] = block_keys(today_lines)
 
     inserted_total = sum(len(entries) for group in section_groups.values() for entries in group.values())
 
@@ -440,9 +517,33 @@ def main() -> int:
         return 1
 
     total_inserted = 0
-    for spec in specs:
-        inserted = run_single_import(spec, dry_run=args.dry_run, quiet=args.quiet)
-        total_inserted += inserted
+    unwritten = False
+    # Read on the first import with tasks to check, so a run where no source
+    # matches doesn't need the today file.
+    today = lru_cache(maxsize=None)(load_today)
+    # Source reads are independent, so overlap them; imports are still applied
+    # one at a time against one in-memory copy of the today file, written once
+    # at the end. A source that is the today file itself is read at its turn,
+    # after writing out what earlier imports added. (os.path.realpath, unlike
+    # Path.resolve, doesn't raise on a symlink loop; that source is skipped.)
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(specs))) as executor:
+        pending = [
+            None if Path(os.path.realpath(spec.source_path)) == TODAY_FILE else executor.submit(load_source, spec)
+            for spec in specs
+        ]
+        for spec, loaded in zip(specs, pending):
+            if loaded is None and unwritten:
+                write_lines(TODAY_FILE, today()[0])
+                unwritten = False
+            inserted = run_single_import(
+                spec, today, loaded, dry_run=args.dry_run, quiet=args.quiet
+            )
+            if inserted and not args.dry_run:
+                unwritten = True
+            total_inserted += inserted
+
+    if unwritten:
+        write_lines(TODAY_FILE, today()[0])
 
     if args.dry_run:
         return 0
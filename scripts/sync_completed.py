@@ -6,15 +6,18 @@ Move checked tasks from all non-Python files into 04_completed.txt.
 from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import re
 import sys
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Sequence, Set, Tuple
 
 ROOT = Path(__file__).resolve().parent.parent
 COMPLETED_FILE = ROOT / "04_completed.txt"
+MAX_WRITE_WORKERS = 4
 
 # Directories/files to exclude
 EXCLUDE_DIRS = {"__pycache__", "scripts", ".git"}
@@ -22,6 +25,10 @@ EXCLUDE_FILES = {COMPLETED_FILE.name}
 
 TASK_REGEX = re.compile(r"\[x\]\s*(.*)", re.IGNORECASE)
 BULLET_PREFIX_REGEX = re.compile(r"^(?:[-*+]\s+|\d+[.)]\s+)")
+# Characters allowed between the check mark and the task text
+CHECKED_SEPARATORS = " \t:-"
+# "[x]" or a lone "x" followed by a separator (or nothing), either case
+CHECKED_PREFIX_REGEX = re.compile(r"\[[xX]\]|[xX](?=[" + re.escape(CHECKED_SEPARATORS) + r"]|\Z)")
 
 
 @dataclass(frozen=True)
@@ -32,8 +39,17 @@ class TaskEntry:
     line_index: int
 
 
+@dataclass(slots=True)
+class CompletedSection:
+    entries: List[str] = field(default_factory=list)
+    tasks: Set[str] = field(default_factory=set)
+
+
+# Logged and source task texts repeat from run to run
+@lru_cache(maxsize=4096)
 def normalize_task(text: str) -> str:
-    return " ".join(text.strip().split())
+    # split() already drops leading/trailing whitespace, so no strip() copy
+    return " ".join(text.split())
 
 
 def extract_task_text(line: str) -> str:
@@ -43,36 +59,49 @@ def extract_task_text(line: str) -> str:
     return normalize_task(line)
 
 
-def load_completed() -> Tuple[List[str], Dict[str, List[str]], Dict[str, Set[str]]]:
-    section_order: List[str] = []
-    section_entries: Dict[str, List[str]] = {}
-    section_tasks: Dict[str, Set[str]] = {}
-    current_section: str | None = None
+def logged_task_text(entry_line: str) -> str:
+    """extract_task_text for logged "\t[date] [x] text" entries, without the regex."""
+    head, sep, tail = entry_line.partition("] [x] ")
+    # With no "x" before it, this is the first "[x]" TASK_REGEX would find
+    if sep and "x" not in head and "X" not in head:
+        return normalize_task(tail)
+    return extract_task_text(entry_line)
+
+
+def load_completed() -> Dict[str, CompletedSection]:
+    """Sections of the completed file, in file order."""
+    sections: Dict[str, CompletedSection] = {}
+    current: CompletedSection | None = None
 
     if not COMPLETED_FILE.exists():
-        return section_order, section_entries, section_tasks
+        return sections
 
-    for raw_line in COMPLETED_FILE.read_text().splitlines():
-        stripped = raw_line.strip()
-        if not stripped:
-            continue
+    # Stream the file instead of holding its text and a list of all its lines
+    with COMPLETED_FILE.open(buffering=1 << 16) as fh:
+        for file_line in fh:
+            # splitlines() also breaks on \f, \v and friends, as reading the whole text did
+            for raw_line in file_line.splitlines():
+                stripped = raw_line.strip()
+                if not stripped:
+                    continue
 
-        if raw_line.lstrip() == raw_line:
-            current_section = stripped
-            if current_section not in section_entries:
-                section_order.append(current_section)
-                section_entries[current_section] = []
-                section_tasks[current_section] = set()
-            continue
+                if not raw_line[0].isspace():
+                    current = sections.get(stripped)
+                    if current is None:
+                        current = sections[stripped] = CompletedSection()
+                    continue
 
-        if current_section is None:
-            continue
+                if current is None:
+                    continue
 
-        entry_line = raw_line.rstrip()
-        section_entries[current_section].append(entry_line)
-        section_tasks[current_section].add(extract_task_text(entry_line))
+                entry_line = raw_line.rstrip()
+                current.tasks.add(logged_task_text(entry_line))
+                # Store entries in the tab-indented form they are written back in
+                if not entry_line.startswith("\t"):
+                    entry_line = "\t" + entry_line.lstrip()
+                current.entries.append(entry_line)
 
-    return section_order, section_entries, section_tasks
+    return sections
 
 
 def parse_checked_task(raw_line: str) -> str | None:
@@ -84,24 +113,29 @@ def parse_checked_task(raw_line: str) -> str | None:
     if bullet_match:
         stripped = stripped[bullet_match.end():].lstrip()
 
-    lowered = stripped.lower()
-    remainder: str | None = None
-
-    if lowered.startswith("[x]"):
-        remainder = stripped[3:]
-    elif lowered.startswith("x") and (len(stripped) == 1 or stripped[1] in {" ", "\t", "-", ":"}):
-        remainder = stripped[1:]
-    else:
+    checked_match = CHECKED_PREFIX_REGEX.match(stripped)
+    if not checked_match:
         return None
 
-    remainder = remainder.lstrip(" \t:-")
+    remainder = stripped[checked_match.end():].lstrip(CHECKED_SEPARATORS)
     task_text = normalize_task(remainder)
     return task_text or None
 
 
 def leading_indent(raw_line: str) -> int:
-    expanded = raw_line.expandtabs(4)
-    return len(expanded) - len(expanded.lstrip())
+    # Same as expandtabs(4) and measuring, but only walks the indent
+    # (lines come from splitlines(), so there is no CR to reset the column)
+    indent = 0
+    for ch in raw_line:
+        if ch == " ":
+            indent += 1
+        elif ch == "\t":
+            indent += 4 - indent % 4
+        elif ch.isspace():
+            indent += 1
+        else:
+            break
+    return indent
 
 
 def extract_tasks_from_lines(lines: List[str], file_path: Path) -> List[TaskEntry]:
@@ -129,7 +163,7 @@ def extract_tasks_from_lines(lines: List[str], file_path: Path) -> List[TaskEntr
             tasks.append(TaskEntry(section_name, full_text, file_path, idx))
             continue
 
-        if raw_line.lstrip() == raw_line:
+        if not raw_line[0].isspace():
             current_section = stripped
             context_stack.clear()
             continue
@@ -188,7 +222,8 @@ def gather_source_tasks() -> Tuple[Dict[Path, List[str]], List[TaskEntry]]:
 
     for file_path in source_files:
         try:
-            lines = file_path.read_text(encoding="utf-8").splitlines()
+            # Bytes + decode skips the text-mode wrapper; splitlines() handles CRLF the same
+            lines = file_path.read_bytes().decode("utf-8").splitlines()
             sources[file_path] = lines
             tasks.extend(extract_tasks_from_lines(lines, file_path))
         except (UnicodeDecodeError, PermissionError):
@@ -198,27 +233,48 @@ def gather_source_tasks() -> Tuple[Dict[Path, List[str]], List[TaskEntry]]:
     return sources, tasks
 
 
+def rewrite_source(file_path: Path, lines: List[str], indexes: List[int]) -> None:
+    # Copy the runs of lines between removed (sorted) indexes instead of testing every line
+    new_lines: List[str] = []
+    start = 0
+    for idx in indexes:
+        new_lines.extend(lines[start:idx])
+        start = idx + 1
+    new_lines.extend(lines[start:])
+    content = "\n".join(new_lines).rstrip()
+    file_path.write_bytes((content + "\n").encode("utf-8") if content else b"")
+
+
 def remove_tasks_from_sources(
     sources: Dict[Path, List[str]], tasks: List[TaskEntry]
 ) -> Dict[Path, int]:
     removal_counts: Dict[Path, int] = {}
-    indexes_by_file: Dict[Path, Set[int]] = defaultdict(set)
+    # Each task comes from its own line, so the indexes are already unique
+    indexes_by_file: Dict[Path, List[int]] = defaultdict(list)
 
     for task in tasks:
-        indexes_by_file[task.file_path].add(task.line_index)
+        indexes_by_file[task.file_path].append(task.line_index)
 
+    # Only files that contributed a task are here, and each loses at least one
+    # line, so every one of them needs rewriting; untouched files are never opened.
+    rewrites: List[Tuple[Path, List[str], List[int]]] = []
     for file_path, indexes in indexes_by_file.items():
         lines = sources.get(file_path)
-        if lines is None or not indexes:
+        if lines is None:
             continue
-        new_lines = [line for idx, line in enumerate(lines) if idx not in indexes]
-        content = "\n".join(new_lines).rstrip()
-        if content:
-            file_path.write_text(content + "\n", encoding="utf-8")
-        else:
-            file_path.write_text("", encoding="utf-8")
+        indexes.sort()
+        rewrites.append((file_path, lines, indexes))
         removal_counts[file_path] = len(indexes)
 
+    # Each file is rewritten independently; overlap the writes when there are several
+    if len(rewrites) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(rewrites))) as executor:
+            for future in [executor.submit(rewrite_source, *rewrite) for rewrite in rewrites]:
+                future.result()
+    else:
+        for rewrite in rewrites:
+            rewrite_source(*rewrite)
+
     return removal_counts
 
 
@@ -229,38 +285,49 @@ def sync_completed() -> Tuple[int, int, List[Tuple[str, str, str]], Dict[Path, i
         return 0, 0, [], {}
 
     today_str = date.today().isoformat()
-    section_order, section_entries, section_tasks = load_completed()
+    sections = load_completed()
     tasks_added: List[Tuple[str, str, str]] = []
+    # The same task seen again (same file, section and text) is always a
+    # duplicate, so skip it before building its decorated text.
+    seen_tasks: Set[Tuple[str, Path, str]] = set()
 
     for task in tasks:
+        section_name = task.section
+        task_key = (section_name, task.file_path, task.text)
+        if task_key in seen_tasks:
+            continue
+        seen_tasks.add(task_key)
+
         source_label = task.file_path.stem
         decorated_task_text = f"[{source_label}] {task.text}"
-        section_name = task.section
-        if section_name not in section_entries:
-            section_order.append(section_name)
-            section_entries[section_name] = []
-            section_tasks[section_name] = set()
+        section = sections.get(section_name)
+        if section is None:
+            section = sections[section_name] = CompletedSection()
 
-        if decorated_task_text in section_tasks[section_name]:
+        if decorated_task_text in section.tasks:
             continue
 
         entry = f"\t[{today_str}] [x] {decorated_task_text}"
-        section_entries[section_name].append(entry)
-        section_tasks[section_name].add(decorated_task_text)
+        section.entries.append(entry)
+        section.tasks.add(decorated_task_text)
         tasks_added.append((section_name, decorated_task_text, task.file_path.name))
 
+    # All duplicates: the completed file is left as it is
     if tasks_added:
-        lines: List[str] = []
-        for idx, section_name in enumerate(section_order):
-            lines.append(section_name)
-            for entry in section_entries.get(section_name, []):
-                entry_out = entry
-                if not entry_out.startswith("\t"):
-                    entry_out = "\t" + entry_out.lstrip()
-                lines.append(entry_out.rstrip())
-            if idx != len(section_order) - 1:
-                lines.append("")
-        COMPLETED_FILE.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+        # Written a section at a time. Entries are stored tab-indented with no
+        # trailing whitespace and are never blank, so only the file's last
+        # line needs the trailing-whitespace trim.
+        last_idx = len(sections) - 1
+        with COMPLETED_FILE.open("wb", buffering=1 << 16) as fh:
+            for idx, (section_name, section) in enumerate(sections.items()):
+                lines: List[str] = [section_name, *section.entries]
+                if idx == last_idx:
+                    lines[-1] = lines[-1].rstrip()
+                    lines.append("")
+                else:
+                    lines.append("\n")
+                # One encode per section, straight into the byte buffer
+                fh.write("\n".join(lines).encode("utf-8"))
 
     removal_counts = remove_tasks_from_sources(sources, tasks)
     return total_found, len(tasks_added), tasks_added, removal_counts
@@ -6,12 +6,19 @@ Analyze completed tasks: count per day and calculate average.
 from pathlib import Path
 import re
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict
 
 COMPLETED_FILE = Path(__file__).resolve().parent.parent / "04_completed.txt"
 DATE_PATTERN = re.compile(r'\[(\d{4}-\d{2}-\d{2})\]')
+# Swallowing the rest of the line leaves findall() with the first date of each line
+FIRST_DATE_PATTERN = re.compile(DATE_PATTERN.pattern + r'.*')
+# Line breaks splitlines() knows about but "." still matches
+OTHER_LINE_BREAKS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+# Longest bar drawn per day; shorter bars are slices of it
+FULL_BAR = "█" * 50
 
 
 def parse_completed_tasks(file_path: Path) -> Dict[str, int]:
@@ -22,8 +29,14 @@ def parse_completed_tasks(file_path: Path) -> Dict[str, int]:
         print(f"Error: {file_path} not found", file=sys.stderr)
         sys.exit(1)
     
+    text = file_path.read_text()
+    
+    # Usual case: newline-separated lines, tallied in one C-level pass
+    if not any(ch in text for ch in OTHER_LINE_BREAKS):
+        return dict(Counter(FIRST_DATE_PATTERN.findall(text)))
+    
     tasks_per_day: Dict[str, int] = defaultdict(int)
-    lines = file_path.read_text().splitlines()
+    lines = text.splitlines()
     
     for line in lines:
         match = DATE_PATTERN.search(line)
@@ -34,6 +47,7 @@ def parse_completed_tasks(file_path: Path) -> Dict[str, int]:
     return dict(tasks_per_day)
 
 
+@lru_cache(maxsize=1024)
 def format_date(date_str: str) -> str:
     """Format date string for display."""
     try:
@@ -80,7 +94,7 @@ def display_stats(tasks_per_day: Dict[str, int]):
     
     for date_str, count in sorted_days:
         formatted_date = format_date(date_str)
-        bar = "█" * min(count, 50)  # Cap bar at 50 for display
+        bar = FULL_BAR[:count]  # Capped at 50 for display
         print(f"{formatted_date:25} {count:3} tasks  {bar}")
     
     print()
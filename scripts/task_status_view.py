@@ -4,14 +4,21 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
 import os
 import re
+import stat
 import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from functools import lru_cache
 from glob import glob
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Tuple
+from typing import Any, BinaryIO, Dict, Iterator, List, Sequence, Set, Tuple
 
 STATUS_TAGS = {
     "b": "blocked",
@@ -21,6 +28,10 @@ STATUS_TAGS = {
     "x": "done",
     "t": "transfer",
 }
+# Tag character in either case to status, so the parser doesn't lower() it
+STATUS_BY_CHAR = {**STATUS_TAGS, **{tag.upper(): status for tag, status in STATUS_TAGS.items()}}
+# Raw bytes of each tag, to skip files that can't contain a task
+TAG_MARKERS = [(f"[{char}]".encode(), status) for char, status in STATUS_BY_CHAR.items()]
 
 STATUS_LABELS = {
     "blocked": "Blocked",
@@ -33,8 +44,14 @@ STATUS_LABELS = {
 
 STATUS_ORDER = ["blocked", "in-progress", "waiting", "delegated", "done"]
 STATUS_PATTERN = re.compile(r"^\s*\[([bdwixt])\]\s*(.*)$", re.IGNORECASE)
-LEGEND_PATTERN = re.compile(r"^\[[^\]]+\]\s*=", re.IGNORECASE)
+LEGEND_PATTERN = re.compile(r"^\s*\[[^\]]+\]\s*=", re.IGNORECASE)
 HEADING_PATTERN = re.compile(r"^\s*(#+)\s*(.+?)\s*$")
+# Every character STATUS_PATTERN's case-insensitive [bdwixt] accepts (dotted and
+# dotless i included), so parse_lines can check tags without the regex
+STATUS_CHARS = frozenset("bdwixtBDWIXT\u0130\u0131")
+# Line breaks str.splitlines() honours besides "\n" (CR included, since files
+# are decoded from bytes without newline translation)
+OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
 
 STATUS_ALIASES = {
     "b": "blocked",
@@ -71,28 +88,64 @@ DEFAULT_SOURCES = [
 
 PROJECTS_DIR = ROOT / "projects"
 CONFIG_FILE = ROOT / "scripts" / "task_sources.json"
+# Parsed tasks per source, reused while a file's mtime and size are unchanged
+CACHE_FILE = ROOT / "scripts" / ".task_status_view_cache.json"
+CACHE_VERSION = 3
+MAX_PARSE_WORKERS = 8
+WRITE_BUFFER_SIZE = 1 << 16
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskEntry:
     status: str
     section: str
     file_path: Path
     lines: List[str]
     headings: List[str] = field(default_factory=list)
+    # Slot backing canonical_key, since cached_property needs a __dict__
+    key_cache: str | None = field(default=None, init=False, repr=False, compare=False)
 
+    @property
+    def canonical_key(self) -> str:
+        """Block text used to detect duplicate tasks; computed once per entry."""
+        if self.key_cache is None:
+            self.key_cache = canonicalize_lines(self.lines)
+        return self.key_cache
 
-@dataclass
+
+@dataclass(slots=True)
 class StatusOutputTarget:
     path: Path
     statuses: List[str]
     title: str
 
 
-def leading_indent(line: str) -> int:
+def canonicalize_lines(lines: List[str]) -> str:
+    normalized = [stripped for stripped in (line.strip() for line in lines) if stripped]
+    return "\n".join(normalized)
+
+
+def leading_indent(line: str, _tab: int = 4) -> int:
     """Return indentation length treating tabs as four spaces."""
-    expanded = line.expandtabs(4)
-    return len(expanded) - len(expanded.lstrip())
+    # Without tabs every whitespace character is one column.
+    if "\t" not in line:
+        return len(line) - len(line.lstrip())
+    # An indent of tabs alone is whole tab stops.
+    tabs = len(line) - len(line.lstrip("\t"))
+    if not line[tabs:tabs + 1].isspace():
+        return tabs * _tab
+    # Same result as expanding tabs and measuring, without copying the line.
+    n = 0
+    for ch in line:
+        if ch == " ":
+            n += 1
+        elif ch == "\t":
+            n += _tab - n % _tab
+        elif ch.isspace():
+            n += 1
+        else:
+            break
+    return n
 
 
 def default_status_outputs() -> List[Dict[str, object]]:
@@ -140,6 +193,8 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     }
 
 
+# extra_files and status_outputs often repeat paths, and each resolve() walks them
+@lru_cache(maxsize=None)
 def resolve_path(base: Path, path_str: str) -> Path:
     expanded = os.path.expanduser(path_str)
     candidate = Path(expanded)
@@ -154,9 +209,8 @@ def expand_glob(base: Path, pattern: str) -> List[Path]:
         pattern_path = str((base / pattern).resolve())
     matches = []
     for match in glob(os.path.expanduser(pattern_path), recursive=True):
-        path_obj = Path(match)
-        if path_obj.is_file():
-            matches.append(path_obj.resolve())
+        if os.path.isfile(match):
+            matches.append(Path(match).resolve())
     return matches
 
 
@@ -165,8 +219,8 @@ def gather_sources(root: Path) -> Tuple[List[Path], Dict[str, Any]]:
     seen = set()
     sources: List[Path] = []
 
-    def add_path(path: Path) -> None:
-        if not path.is_file():
+    def add_path(path: Path, is_file: bool = False) -> None:
+        if not is_file and not path.is_file():
             print(f"[status-view] Skipping missing file: {path}", file=sys.stderr)
             return
         if path in seen:
@@ -179,9 +233,14 @@ def gather_sources(root: Path) -> Tuple[List[Path], Dict[str, Any]]:
 
     projects_dir = PROJECTS_DIR.resolve()
     if projects_dir.is_dir():
-        for child in sorted(projects_dir.iterdir()):
-            if child.is_file():
-                add_path(child.resolve())
+        # scandir answers is_file() from the directory listing, and only
+        # symlinks need resolving since projects_dir already is
+        with os.scandir(projects_dir) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            if entry.is_file():
+                child = Path(entry.path)
+                add_path(child.resolve() if entry.is_symlink() else child, is_file=True)
 
     config_path = CONFIG_FILE.resolve()
     try:
@@ -260,93 +319,209 @@ def build_output_targets(root: Path, config: Dict[str, Any]) -> List[StatusOutpu
     return targets
 
 
-def parse_file(file_path: Path) -> List[TaskEntry]:
-    """Extract status-tagged tasks from a file."""
+def parse_file(file_path: Path, keep: Set[str] | None = None) -> List[TaskEntry]:
+    """Extract status-tagged tasks from a file, only those in keep if given."""
+    # One binary read and decode, without the text-mode wrapper
+    data = file_path.read_bytes()
     try:
-        lines = file_path.read_text().splitlines()
+        text = data.decode("utf-8")
     except UnicodeDecodeError:
-        print(f"[status-view] Cannot decode file (skipping): {file_path}", file=sys.stderr)
+        print(f"[status-view] File is not UTF-8, reading it as Latin-1: {file_path}", file=sys.stderr)
+        text = data.decode("latin-1")
+    # Both decodings keep ASCII, so a file without any tag bytes has no tasks
+    if not any(marker in data for marker, status in TAG_MARKERS if keep is None or status in keep):
         return []
+    return parse_lines(split_lines(text), file_path, keep)
+
+
+def split_lines(text: str) -> List[str]:
+    """Same lines as text.splitlines(), using the faster split("\n") when it gives the same result."""
+    if any(ch in text for ch in OTHER_LINE_BREAKS):
+        return text.splitlines()
+    lines = text.split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
 
+def parse_lines(lines: List[str], file_path: Path, keep: Set[str] | None = None) -> List[TaskEntry]:
+    """Extract status-tagged tasks from lines already read from file_path."""
     tasks: List[TaskEntry] = []
     section = "Uncategorized"
     idx = 0
     heading_stack: List[str] = []
-
-    while idx < len(lines):
+    # Locals for the lookups made on every line.
+    legend_match = LEGEND_PATTERN.match
+    heading_match_line = HEADING_PATTERN.match
+    status_of = STATUS_BY_CHAR.get
+    add_task = tasks.append
+    line_count = len(lines)
+    # Indent of the line that ended the previous block, so it isn't measured twice.
+    seen_idx = -1
+    seen_indent = 0
+
+    while idx < line_count:
         line = lines[idx]
-        stripped = line.strip()
 
-        if not stripped:
+        # Classify each line by its first non-blank character, so the legend
+        # and heading patterns only run on lines that can match them.
+        body = line.lstrip()
+        if not body:
             idx += 1
             continue
 
-        if LEGEND_PATTERN.match(stripped):
-            idx += 1
-            continue
+        top_level = len(body) == len(line)
+        first = body[0]
 
-        heading_match = HEADING_PATTERN.match(line)
-        if heading_match:
-            hashes = heading_match.group(1)
-            heading_text = heading_match.group(2).strip()
-            level = len(hashes)
-            heading_label = f"{'#' * level} {heading_text}"
-            while len(heading_stack) >= level:
-                heading_stack.pop()
-            heading_stack.append(heading_label)
-            if line.lstrip() == line and stripped:
-                section = stripped
-            idx += 1
-            continue
-
-        if line.lstrip() == line and not STATUS_PATTERN.match(line):
-            section = stripped
+        if first == "[":
+            if legend_match(body):
+                idx += 1
+                continue
+            tag = body[1] if len(body) > 2 and body[2] == "]" else None
+            if tag in STATUS_CHARS:
+                status = status_of(tag)
+                if status is None:
+                    idx += 1
+                    continue
+            else:
+                if top_level:
+                    section = sys.intern(line.rstrip())
+                idx += 1
+                continue
+        else:
+            if first == "#":
+                heading_match = heading_match_line(body)
+                if heading_match:
+                    hashes = heading_match.group(1)
+                    heading_text = heading_match.group(2).strip()
+                    level = len(hashes)
+                    heading_label = f"{'#' * level} {heading_text}"
+                    while len(heading_stack) >= level:
+                        heading_stack.pop()
+                    heading_stack.append(heading_label)
+                    if top_level:
+                        section = sys.intern(line.rstrip())
+                    idx += 1
+                    continue
+            if top_level:
+                section = sys.intern(line.rstrip())
             idx += 1
             continue
 
-        match = STATUS_PATTERN.match(line)
-        if not match:
-            idx += 1
-            continue
+        base_indent = seen_indent if seen_idx == idx else leading_indent(line)
+        idx += 1
 
-        status_key = match.group(1).lower()
-        status = STATUS_TAGS.get(status_key)
-        if status is None:
-            idx += 1
+        if keep is not None and status not in keep:
+            # Step over the nested lines without copying them
+            while idx < line_count:
+                next_line = lines[idx]
+                if next_line and not next_line.isspace():
+                    next_indent = leading_indent(next_line)
+                    if next_indent <= base_indent:
+                        seen_idx = idx
+                        seen_indent = next_indent
+                        break
+                idx += 1
             continue
 
         block = [line.rstrip()]
-        base_indent = leading_indent(line)
-        idx += 1
-
-        while idx < len(lines):
+        while idx < line_count:
             next_line = lines[idx]
-            next_stripped = next_line.strip()
-            next_indent = leading_indent(next_line)
 
-            if not next_stripped:
+            if not next_line or next_line.isspace():
                 block.append(next_line.rstrip())
                 idx += 1
                 continue
 
-            if next_line.lstrip() == next_line and next_stripped and not STATUS_PATTERN.match(next_line):
-                break
-
-            next_match = STATUS_PATTERN.match(next_line)
-            if next_match and next_indent <= base_indent:
-                break
-
+            # Unindented lines (sections or top-level tasks) always measure 0,
+            # so one indent check also covers the section break.
+            next_indent = leading_indent(next_line)
             if next_indent <= base_indent:
+                seen_idx = idx
+                seen_indent = next_indent
                 break
 
             block.append(next_line.rstrip())
             idx += 1
 
-        tasks.append(TaskEntry(status, section, file_path, block, list(heading_stack)))
+        add_task(TaskEntry(status, section, file_path, block, list(heading_stack)))
 
     return tasks
 
 
+def load_parse_cache() -> Dict[str, Any]:
+    try:
+        data = json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_parse_cache(files: Dict[str, Any]) -> None:
+    """Replace the cache file in one step so a reader never sees it half written."""
+    payload = json.dumps({"version": CACHE_VERSION, "files": files}, separators=(",", ":"))
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_FILE.parent, prefix=CACHE_FILE.name)
+    except OSError as exc:
+        print(f"[status-view] Could not write parse cache: {exc}", file=sys.stderr)
+        return
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(payload)
+        os.replace(tmp_name, CACHE_FILE)
+    except OSError as exc:
+        print(f"[status-view] Could not write parse cache: {exc}", file=sys.stderr)
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+def parse_sources(sources: List[Path], keep: Set[str] | None = None) -> List[List[TaskEntry]]:
+    """
+    parse_file for each source, only the tasks in keep if given, skipping files
+    unchanged since the cached parse. Records hold every status, so runs with
+    different filters share them.
+    """
+    cached = load_parse_cache()
+    records: List[Any] = []
+    results: List[List[TaskEntry] | None] = []
+    misses: List[int] = []
+    for src in sources:
+        stat = src.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        hit = cached.get(str(src))
+        if isinstance(hit, list) and len(hit) == 2 and hit[0] == stamp:
+            records.append(hit)
+            results.append([
+                TaskEntry(status, sys.intern(section), src, lines, headings)
+                for status, section, lines, headings in hit[1]
+                if keep is None or status in keep
+            ])
+        else:
+            records.append(stamp)
+            results.append(None)
+            misses.append(len(records) - 1)
+
+    # Files are independent, so parse the changed ones concurrently
+    if len(misses) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(misses))) as executor:
+            parsed = list(executor.map(parse_file, [sources[idx] for idx in misses]))
+    else:
+        parsed = [parse_file(sources[idx]) for idx in misses]
+    for idx, entries in zip(misses, parsed):
+        results[idx] = [e for e in entries if keep is None or e.status in keep]
+        records[idx] = [records[idx], [[e.status, e.section, e.lines, e.headings] for e in entries]]
+
+    files = {str(src): record for src, record in zip(sources, records)}
+    if files != cached:
+        save_parse_cache(files)
+    return results
+
+
 def normalize_status_filters(raw_filters: Sequence[str] | None) -> List[str]:
     if not raw_filters:
         return STATUS_ORDER
@@ -392,6 +567,8 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+# Called for every entry in every report, for only a handful of distinct files
+@lru_cache(maxsize=None)
 def format_relative(root: Path, path: Path) -> str:
     try:
         return str(path.relative_to(root))
@@ -402,14 +579,21 @@ def format_relative(root: Path, path: Path) -> str:
 def build_section_lines(entries: List[TaskEntry], root: Path) -> List[str]:
     lines: List[str] = []
     current_section: Tuple[str, str] | None = None
+    # Entries of one file share its path and (interned) section objects, so
+    # the identity check skips the key for most entries
+    last_path: Path | None = None
+    last_section: str | None = None
     for entry in entries:
-        rel_path = format_relative(root, entry.file_path)
-        section_key = (entry.section, rel_path)
-        if section_key != current_section:
-            if current_section is not None:
-                lines.append("")
-            lines.append(f"{entry.section} — {rel_path}")
-            current_section = section_key
+        if entry.file_path is not last_path or entry.section is not last_section:
+            last_path = entry.file_path
+            last_section = entry.section
+            rel_path = format_relative(root, last_path)
+            section_key = (last_section, rel_path)
+            if section_key != current_section:
+                if current_section is not None:
+                    lines.append("")
+                lines.append(f"{last_section} — {rel_path}")
+                current_section = section_key
         for line in entry.lines:
             lines.append(f"  {line}")
     while lines and lines[-1] == "":
@@ -417,63 +601,131 @@ def build_section_lines(entries: List[TaskEntry], root: Path) -> List[str]:
     return lines
 
 
-def render_status_report(title: str, statuses: List[str], tasks_by_status: Dict[str, List[TaskEntry]], root: Path) -> str:
-    heading = title.strip() or "Status Report"
-    lines = [
-        heading,
-        "=" * len(heading),
-        "",
-    ]
+@lru_cache(maxsize=None)
+def rule(char: str, width: int) -> str:
+    return char * width
+
 
-    any_entries = False
-    for status in statuses:
-        entries = tasks_by_status.get(status, [])
+def write_status_report(writer: BinaryIO, title: str, statuses: List[str], tasks_by_status: Dict[str, List[TaskEntry]], root: Path) -> None:
+    """Write the report to a binary stream one status section at a time."""
+    heading = title.strip() or "Status Report"
+    writer.write(f"{heading}\n{rule('=', len(heading))}\n\n".encode("utf-8"))
+
+    # The last non-blank line written so far and any blank lines after it.
+    # They only go out once another section follows, since the report ends
+    # at its last non-blank line.
+    held: List[str] = []
+    labelled = [(status, STATUS_LABELS.get(status, status.title())) for status in statuses]
+    for status, label in labelled:
+        entries = tasks_by_status.get(status)
         if not entries:
             continue
-        any_entries = True
-        label = STATUS_LABELS.get(status, status.title())
+        lines = held + [""] if held else []
         lines.append(label)
-        lines.append("-" * len(label))
+        lines.append(rule("-", len(label)))
         lines.extend(build_section_lines(entries, root))
-        lines.append("")
+        cut = len(lines) - 1
+        while not lines[cut].strip():
+            cut -= 1
+        if cut:
+            writer.write(("\n".join(lines[:cut]) + "\n").encode("utf-8"))
+        held = lines[cut:]
 
-    if not any_entries:
-        lines.append("No tasks found for these statuses.")
+    if not held:
+        held = ["No tasks found for these statuses."]
+    writer.write((held[0].rstrip() + "\n").encode("utf-8"))
 
-    return "\n".join(lines).rstrip() + "\n"
+
+def render_status_report(title: str, statuses: List[str], tasks_by_status: Dict[str, List[TaskEntry]], root: Path) -> str:
+    buffer = io.BytesIO()
+    write_status_report(buffer, title, statuses, tasks_by_status, root)
+    return buffer.getvalue().decode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def new_file_mode() -> int:
+    """Mode open() gives a file it creates: 0o666 less the umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def replaced_on_success(path: Path) -> Iterator[BinaryIO]:
+    """
+    Binary writer for a temp file next to path that replaces path once the
+    block completes, so an error part way leaves the old file untouched.
+    The file keeps path's mode, as rewriting it in place would.
+    """
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = new_file_mode()
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        with os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+            os.chmod(tmp_name, mode)
+            yield fh
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
 
 
 def write_status_files(tasks_by_status: Dict[str, List[TaskEntry]], root: Path, targets: List[StatusOutputTarget]) -> List[Path]:
     written: List[Path] = []
-    for target in targets:
-        content = render_status_report(target.title, target.statuses, tasks_by_status, root)
-        target.path.parent.mkdir(parents=True, exist_ok=True)
-        target.path.write_text(content)
+    # Reports are streamed to a temp file that then replaces theirs, except
+    # ones several targets share, which are rendered once and kept
+    keys = [(target.title, tuple(target.statuses)) for target in targets]
+    shared = {key for key, count in Counter(keys).items() if count > 1}
+    rendered: Dict[Tuple[str, Tuple[str, ...]], bytes] = {}
+    parents = set()
+    for target, key in zip(targets, keys):
+        if target.path.parent not in parents:
+            target.path.parent.mkdir(parents=True, exist_ok=True)
+            parents.add(target.path.parent)
+        if key in shared:
+            data = rendered.get(key)
+            if data is None:
+                buffer = io.BytesIO()
+                write_status_report(buffer, target.title, target.statuses, tasks_by_status, root)
+                data = rendered[key] = buffer.getvalue()
+            with replaced_on_success(target.path) as fh:
+                fh.write(data)
+        else:
+            with replaced_on_success(target.path) as fh:
+                write_status_report(fh, target.title, target.statuses, tasks_by_status, root)
         written.append(target.path)
     return written
 
 
 def output(tasks_by_status: Dict[str, List[TaskEntry]], root: Path, selected: List[str]) -> None:
-    printed_any = False
+    # One line per former print(), written in a single call
+    out: List[str] = []
+    labels = STATUS_LABELS
+    bar = "=" * 70
     for status in selected:
-        entries = tasks_by_status.get(status, [])
+        entries = tasks_by_status.get(status)
         if not entries:
             continue
 
-        printed_any = True
-        label = STATUS_LABELS[status]
-        print(f"\n{'=' * 70}")
-        print(f"{label} ({len(entries)})")
-        print(f"{'=' * 70}")
+        label = labels[status]
+        out.append("\n" + bar)
+        out.append(f"{label} ({len(entries)})")
+        out.append(bar)
         section_lines = build_section_lines(entries, root)
         if section_lines:
-            print()
-            for line in section_lines:
-                print(line)
-        print()
+            out.append("")
+            out.extend(section_lines)
+        out.append("")
+
+    if not out:
+        out.append("No tasks found for the requested status filters.")
 
-    if not printed_any:
-        print("No tasks found for the requested status filters.")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main() -> int:
@@ -488,17 +740,24 @@ def main() -> int:
 
     selected_statuses = normalize_status_filters(args.status)
 
-    tasks_by_status: Dict[str, List[TaskEntry]] = {status: [] for status in STATUS_ORDER}
-    for src in sources:
-        for task in parse_file(src):
-            tasks_by_status.setdefault(task.status, []).append(task)
-
     try:
         output_targets = build_output_targets(root, config)
     except ValueError as exc:
         print(f"[status-view] {exc}", file=sys.stderr)
         return 2
 
+    # Only tasks with a status that gets printed or written are kept
+    keep: Set[str] | None = set(selected_statuses)
+    if args.write_files:
+        keep = keep.union(*(target.statuses for target in output_targets))
+    if keep.issuperset(STATUS_BY_CHAR.values()):
+        keep = None
+
+    tasks_by_status: Dict[str, List[TaskEntry]] = {status: [] for status in STATUS_ORDER}
+    for entries in parse_sources(sources, keep):
+        for task in entries:
+            tasks_by_status.setdefault(task.status, []).append(task)
+
     written_paths: List[Path] = []
     if args.write_files:
         written_paths = write_status_files(tasks_by_status, root, output_targets)